@@ -2,9 +2,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 import json
 
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import Flask, render_template, request, redirect, url_for, flash, session, g, jsonify, has_request_context
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import func, UniqueConstraint, text
+from sqlalchemy import bindparam, case, event, func, lambda_stmt, select, UniqueConstraint, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload, selectinload
 
 app = Flask(__name__)
 app.secret_key = "change-this"
@@ -13,6 +15,8 @@ CFG_PATH = Path(__file__).with_name("settings.json")
 
 app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_PATH}"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# keep more connections open between requests for the threaded server (default 5)
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_size": 10}
 db = SQLAlchemy(app)
 
 # -------------------- Models --------------------
@@ -28,6 +32,7 @@ class MonthlyBudget(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey("category.id"), nullable=False)
     month_start = db.Column(db.DateTime, nullable=False)
     base_budget = db.Column(db.Float, nullable=False, default=0.0)
+    carry_in = db.Column(db.Float, nullable=False, default=0.0)  # sum of (base - spent) for all earlier months
     category = db.relationship("Category", backref=db.backref("monthly_budgets", lazy=True))
     __table_args__ = (UniqueConstraint('category_id', 'month_start', name='uniq_cat_month'),)
 
@@ -36,13 +41,24 @@ class Purchase(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey("category.id"), nullable=False)
     name = db.Column(db.String(160), nullable=False)
     amount = db.Column(db.Float, nullable=False)
-    ts = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    # stamped by SQLite in the INSERT (UTC, same text format SQLAlchemy writes) and read back via RETURNING
+    ts = db.Column(db.DateTime, nullable=False, default=func.strftime("%Y-%m-%d %H:%M:%f000", "now"))
     category = db.relationship("Category", backref=db.backref("purchases", lazy=True))
+    __table_args__ = (db.Index("ix_purchase_cat_ts", "category_id", "ts"),)
 
 # -------------------- Helpers --------------------
+_CFG_CACHE = {"mtime": None, "data": None}
+_ROLLOVER = {"month": None}
+_MPROG_CACHE = {"month": None, "strs": (), "total": 0.0}
+
 def load_cfg():
-    with CFG_PATH.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    # reparse settings.json only when it changes on disk
+    mtime = CFG_PATH.stat().st_mtime_ns
+    if _CFG_CACHE["mtime"] != mtime:
+        with CFG_PATH.open("r", encoding="utf-8") as f:
+            _CFG_CACHE["data"] = json.load(f)
+        _CFG_CACHE["mtime"] = mtime
+    return _CFG_CACHE["data"]
 
 def month_start(dt):
     return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
@@ -53,60 +69,132 @@ def next_month_start(dt):
         return dt.replace(year=y + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
     return dt.replace(month=m + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
 
-def month_spend_for_category(cat_id, start_dt, end_dt):
-    return (
-        db.session.query(func.coalesce(func.sum(Purchase.amount), 0.0))
-        .filter(Purchase.category_id == cat_id, Purchase.ts >= start_dt, Purchase.ts < end_dt)
-        .scalar() or 0.0
-    )
-
-def get_or_create_monthly_budget(cat: Category, mstart: datetime, default_base: float) -> MonthlyBudget:
+def month_spend_map(cat_ids, start_dt, end_dt) -> dict[int, float]:
+    if not cat_ids:
+        return {}
+    stmt = lambda_stmt(lambda: (
+        select(Purchase.category_id, func.sum(Purchase.amount))
+        .where(Purchase.category_id.in_(cat_ids), Purchase.ts >= start_dt, Purchase.ts < end_dt)
+        .group_by(Purchase.category_id)
+    ))
+    return {cid: spent or 0.0 for cid, spent in db.session.execute(stmt)}
+
+def latest_budget_map(cat_ids, up_to_month_start: datetime) -> dict[int, MonthlyBudget]:
+    """Most recent MonthlyBudget at or before up_to_month_start, keyed by category id."""
+    if not cat_ids:
+        return {}
+    stmt = lambda_stmt(lambda: (
+        select(MonthlyBudget)
+        .where(MonthlyBudget.category_id.in_(cat_ids), MonthlyBudget.month_start <= up_to_month_start)
+        .order_by(MonthlyBudget.category_id, MonthlyBudget.month_start.desc())
+    ))
+    budgets = db.session.execute(stmt).scalars().all()
+    out = {}
+    for mb in budgets:
+        out.setdefault(mb.category_id, mb)
+    return out
+
+def get_or_create_monthly_budget(cat: Category, mstart: datetime, default_base: float, commit: bool = True) -> MonthlyBudget:
     mb = MonthlyBudget.query.filter_by(category_id=cat.id, month_start=mstart).first()
     if not mb:
-        mb = MonthlyBudget(category_id=cat.id, month_start=mstart, base_budget=default_base)
+        mb = MonthlyBudget(category_id=cat.id, month_start=mstart, base_budget=default_base,
+                           carry_in=cumulative_carry_until(cat, mstart))
         db.session.add(mb)
-        db.session.commit()
+        if commit:
+            db.session.commit()
     return mb
 
+def resolve_base_budget(cat: Category, latest_mb, cfg) -> float:
+    """Base in effect given the latest MonthlyBudget at or before the month (None if there is none)."""
+    if latest_mb is not None:
+        return latest_mb.base_budget
+    return cfg["categories"].get(cat.name, 0.0)
+
+def seed_monthly_budgets(cats, mstart: datetime, cfg, commit: bool = True) -> None:
+    """Insert a MonthlyBudget for each category missing one at mstart, in a single statement."""
+    if not cats:
+        return
+    budget_map = latest_budget_map([c.id for c in cats], mstart)
+    rows = [{"category_id": c.id,
+             "month_start": mstart,
+             "base_budget": resolve_base_budget(c, budget_map.get(c.id), cfg),
+             "carry_in": cumulative_carry_until(c, mstart)}
+            for c in cats]
+    stmt = sqlite_insert(MonthlyBudget).on_conflict_do_nothing(index_elements=["category_id", "month_start"])
+    db.session.execute(stmt, rows)
+    if commit:
+        db.session.commit()
+
+def month_key(dt) -> str:
+    return f"{dt.year:04d}-{dt.month:02d}"
+
+# Carry-in at the start of :up. Walks every month from the category's first
+# purchase or budget month up to :up, takes the latest base at or before it
+# (or :default, the settings.json value) and subtracts that month's spend.
+CARRY_SQL = text("""
+WITH RECURSIVE
+  spent AS (
+    SELECT strftime('%Y-%m', ts) AS m, SUM(amount) AS amt
+    FROM purchase WHERE category_id = :cid AND ts < :up GROUP BY m
+  ),
+  budgets AS (
+    SELECT strftime('%Y-%m', month_start) AS m, base_budget
+    FROM monthly_budget WHERE category_id = :cid AND month_start < :up
+  ),
+  months(m) AS (
+    SELECT m FROM (SELECT MIN(m) AS m FROM (SELECT m FROM spent UNION ALL SELECT m FROM budgets))
+    WHERE m IS NOT NULL
+    UNION ALL
+    SELECT strftime('%Y-%m', date(m || '-01', '+1 month')) FROM months
+    WHERE date(m || '-01', '+1 month') < date(:up)
+  )
+SELECT TOTAL(
+  COALESCE((SELECT b.base_budget FROM budgets b WHERE b.m <= months.m ORDER BY b.m DESC LIMIT 1), :default)
+  - COALESCE((SELECT s.amt FROM spent s WHERE s.m = months.m), 0)
+) FROM months
+""").bindparams(bindparam("up", type_=db.DateTime))
+
 def cumulative_carry_until(cat: Category, up_to_month_start: datetime) -> float:
-    first_purchase_ts = db.session.query(func.min(Purchase.ts)).filter(Purchase.category_id == cat.id).scalar()
-    first_budget_ts = db.session.query(func.min(MonthlyBudget.month_start)).filter(MonthlyBudget.category_id == cat.id).scalar()
-    if not first_purchase_ts and not first_budget_ts:
-        return 0.0
-    start = month_start(first_purchase_ts or first_budget_ts)
-    carry = 0.0
-    cur = start
-    while cur < up_to_month_start:
-        nxt = next_month_start(cur)
-        prev_mb = (MonthlyBudget.query
-                   .filter(MonthlyBudget.category_id == cat.id, MonthlyBudget.month_start <= cur)
-                   .order_by(MonthlyBudget.month_start.desc())
-                   .first())
-        if prev_mb:
-            mb = get_or_create_monthly_budget(cat, cur, prev_mb.base_budget)
-        else:
-            default = load_cfg()["categories"].get(cat.name, 0.0)
-            mb = get_or_create_monthly_budget(cat, cur, default)
-        spent = month_spend_for_category(cat.id, cur, nxt)
-        carry += (mb.base_budget - spent)
-        cur = nxt
-    return carry
-
-def current_month_summary(cat: Category, now_utc: datetime):
-    cur_start = month_start(now_utc)
-    nxt_start = next_month_start(cur_start)
-    prev_mb = (MonthlyBudget.query
-               .filter(MonthlyBudget.category_id == cat.id, MonthlyBudget.month_start <= cur_start)
-               .order_by(MonthlyBudget.month_start.desc())
-               .first())
-    if prev_mb and prev_mb.month_start == cur_start:
+    # memoized for the rest of the request; recompute_carry_from drops stale entries
+    cache = g.setdefault("_carry_cache", {}) if has_request_context() else {}
+    key = (cat.id, month_key(up_to_month_start))
+    if key not in cache:
+        params = {"cid": cat.id, "up": up_to_month_start,
+                  "default": load_cfg()["categories"].get(cat.name, 0.0)}
+        cache[key] = db.session.execute(CARRY_SQL, params).scalar()
+    return cache[key]
+
+def recompute_carry_from(cat_id: int, changed_month_start=None) -> None:
+    """
+    Refresh the stored carry_in of every MonthlyBudget after changed_month_start
+    (all of the category's rows when None). Call after anything that changes a
+    month's spend or base budget; the caller commits.
+    """
+    if has_request_context():
+        cache = g.get("_carry_cache", {})
+        for key in [k for k in cache if k[0] == cat_id]:
+            del cache[key]
+    q = MonthlyBudget.query.filter(MonthlyBudget.category_id == cat_id)
+    if changed_month_start is not None:
+        q = q.filter(MonthlyBudget.month_start > changed_month_start)
+    later = q.order_by(MonthlyBudget.month_start).all()
+    if not later:
+        return
+    cat = db.session.get(Category, cat_id)
+    for mb in later:
+        mb.carry_in = cumulative_carry_until(cat, month_start(mb.month_start))
+
+def current_month_summary(cat: Category, cur_start: datetime, spend_map, budget_map):
+    prev_mb = budget_map.get(cat.id)
+    if prev_mb and month_start(prev_mb.month_start) == cur_start:
         base_this_month = prev_mb.base_budget
+        carry_in = prev_mb.carry_in
     else:
-        base_seed = prev_mb.base_budget if prev_mb else load_cfg()["categories"].get(cat.name, 0.0)
-        base_this_month = get_or_create_monthly_budget(cat, cur_start, base_seed).base_budget
-    carry_in = cumulative_carry_until(cat, cur_start)
+        # row not materialized yet (see rollover_month); compute without writing
+        base_this_month = resolve_base_budget(cat, prev_mb, load_cfg())
+        carry_in = cumulative_carry_until(cat, cur_start)
     effective_budget = max(0.0, base_this_month + carry_in)
-    spent = month_spend_for_category(cat.id, cur_start, nxt_start)
+    spent = spend_map.get(cat.id, 0.0)
     remaining = effective_budget - spent
     pct = 0.0 if effective_budget <= 0 else (spent / effective_budget) * 100.0
     over_by = max(0.0, -remaining)
@@ -129,13 +217,10 @@ def ytd_totals(now_utc: datetime, active_only: bool = False):
     """
     start_of_year = datetime(now_utc.year, 1, 1, tzinfo=timezone.utc)
     q = Category.query.filter_by(is_active=True) if active_only else Category.query
-    cats = sort_categories(q.all())
-    rows = []
-    overall = 0.0
-    for c in cats:
-        spent = month_spend_for_category(c.id, start_of_year, now_utc)
-        rows.append({"cat": c, "spent": spent})
-        overall += spent
+    cats = q.order_by(*CATEGORY_ORDER).all()
+    spend_map = month_spend_map([c.id for c in cats], start_of_year, now_utc)
+    rows = [{"cat": c, "spent": spend_map.get(c.id, 0.0)} for c in cats]
+    overall = sum(r["spent"] for r in rows)
     return rows, overall
 
 
@@ -150,68 +235,117 @@ PREFERRED_ORDER = [
     "Groceries",
     "Cars"
 ]
+_ORDER_INDEX = {name: i for i, name in enumerate(PREFERRED_ORDER)}
 
-def sort_categories(cats):
-    order_index = {name: i for i, name in enumerate(PREFERRED_ORDER)}
-    return sorted(cats, key=lambda c: (order_index.get(c.name, 9999), c.name.lower()))
+# use as Category.query.order_by(*CATEGORY_ORDER) so SQLite sorts in the same scan
+CATEGORY_ORDER = (case(_ORDER_INDEX, value=Category.name, else_=9999), func.lower(Category.name))
 
 # -------------------- Init --------------------
-with app.app_context():
-    db.create_all()
-    # --- lightweight SQLite migration: add columns if missing ---
-    def _table_has_column(table, col):
-        rows = db.session.execute(text(f"PRAGMA table_info({table})")).fetchall()
-        return any(r[1] == col for r in rows)
+SCHEMA_VERSION = 1  # bump when adding a migration step below
 
-    if not _table_has_column("Category", "is_active"):
-        db.session.execute(text("ALTER TABLE Category ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT 1"))
-        db.session.commit()
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
 
-    if not _table_has_column("Category", "display_order"):
-        db.session.execute(text("ALTER TABLE Category ADD COLUMN display_order INTEGER NOT NULL DEFAULT 9999"))
+with app.app_context():
+    # all but journal_mode are per-connection, so apply them to every new connection
+    @event.listens_for(db.engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cur.execute(pragma)
+        cur.close()
+
+    db.create_all()
+    # --- lightweight SQLite migration, skipped once PRAGMA user_version is current ---
+    schema_version = db.session.execute(text("PRAGMA user_version")).scalar()
+    migrated = schema_version < SCHEMA_VERSION
+    if migrated:
+        def _columns(table):
+            return {r[1] for r in db.session.execute(text(f"PRAGMA table_info({table})"))}
+
+        category_cols = _columns("Category")
+        if "is_active" not in category_cols:
+            db.session.execute(text("ALTER TABLE Category ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT 1"))
+        if "display_order" not in category_cols:
+            db.session.execute(text("ALTER TABLE Category ADD COLUMN display_order INTEGER NOT NULL DEFAULT 9999"))
+        if "carry_in" not in _columns("monthly_budget"):
+            db.session.execute(text("ALTER TABLE monthly_budget ADD COLUMN carry_in FLOAT NOT NULL DEFAULT 0"))
+        # create_all() skips indexes on tables that already exist
+        db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_purchase_cat_ts ON purchase (category_id, ts)"))
         db.session.commit()
 
+    # seed categories, this month's budgets and (after a migration) stored carry in one transaction
     cfg = load_cfg()
     existing = {c.name for c in Category.query.all()}
     for name in cfg["categories"].keys():
         if name not in existing:
             db.session.add(Category(name=name))
-    db.session.commit()
     now = datetime.now(timezone.utc)
-    cur_start = month_start(now)
-    for c in Category.query.all():
-        seed = cfg["categories"].get(c.name, 0.0)
-        get_or_create_monthly_budget(c, cur_start, seed)
+    all_cats = Category.query.all()
+    seed_monthly_budgets(all_cats, month_start(now), cfg, commit=False)
+    if migrated:
+        # resync stored carry so rows written by older versions are correct, and only
+        # then record the new version, in the same transaction, so a crash here retries
+        for c in all_cats:
+            recompute_carry_from(c.id)
+        db.session.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+    db.session.commit()
+    _ROLLOVER["month"] = month_start(now)
 
 # -------------------- Routes --------------------
+@app.before_request
+def set_request_clock():
+    # one clock reading and month range per request
+    g.now = datetime.now(timezone.utc)
+    g.cur_start = month_start(g.now)
+    g.nxt_start = next_month_start(g.cur_start)
+
+@app.before_request
+def rollover_month():
+    # materialize the new month's budget rows once per process when the month changes
+    if _ROLLOVER["month"] == g.cur_start:
+        return
+    seed_monthly_budgets(Category.query.all(), g.cur_start, load_cfg())
+    _ROLLOVER["month"] = g.cur_start
+
 @app.route("/")
 def index():
-    now = datetime.now(timezone.utc)
+    now, cur, nxt = g.now, g.cur_start, g.nxt_start
 
     # budgets summary rows (active categories only)
-    cats = sort_categories(Category.query.filter_by(is_active=True).all())
-    rows = [{"cat": c, "sum": current_month_summary(c, now)} for c in cats]
-
-    # month range
-    cur = month_start(now)
-    nxt = next_month_start(cur)
+    cats = Category.query.filter_by(is_active=True).order_by(*CATEGORY_ORDER).all()
+    cat_ids = [c.id for c in cats]
+    spend_map = month_spend_map(cat_ids, cur, nxt)
+    budget_map = latest_budget_map(cat_ids, cur)
+    rows = [{"cat": c, "sum": current_month_summary(c, cur, spend_map, budget_map)} for c in cats]
 
     # ALL purchases in the current month (newest first)
     purchases = (
         Purchase.query
+        .options(joinedload(Purchase.category))
         .filter(Purchase.ts >= cur, Purchase.ts < nxt)
         .order_by(Purchase.ts.desc())
         .all()
     )
 
-    # month progress widget fields
-    total = (nxt - cur).total_seconds()
+    # month progress widget fields (date strings and month length only change on rollover)
+    if _MPROG_CACHE["month"] != cur:
+        _MPROG_CACHE["strs"] = (f"{cur.month}/{cur.day}/{cur.year}", f"{nxt.month}/{nxt.day}/{nxt.year}")
+        _MPROG_CACHE["total"] = (nxt - cur).total_seconds()
+        _MPROG_CACHE["month"] = cur
+    total = _MPROG_CACHE["total"]
+    start_str, end_str = _MPROG_CACHE["strs"]
     elapsed = max(0.0, min(total, (now - cur).total_seconds()))
     mprog = {
         "pct": 0.0 if total <= 0 else (elapsed / total) * 100.0,
         "days_left": max(0, int((nxt - now).total_seconds() // 86400)),
-        "start_str": cur.strftime('%-m/%-d/%Y'),
-        "end_str": nxt.strftime('%-m/%-d/%Y'),
+        "start_str": start_str,
+        "end_str": end_str,
     }
 
     return render_template("index.html", rows=rows, purchases=purchases, mprog=mprog)
@@ -225,7 +359,10 @@ def add():
     if not name:
         flash("Name required.", "err")
         return redirect(url_for("index"))
-    db.session.add(Purchase(category_id=cat_id, name=name, amount=amount))
+    p = Purchase(category_id=cat_id, name=name, amount=amount)
+    db.session.add(p)
+    db.session.flush()
+    recompute_carry_from(cat_id, month_start(p.ts))
     db.session.commit()
     flash("Added.", "ok")
     return redirect(url_for("index"))
@@ -234,6 +371,8 @@ def add():
 def delete(pid):
     p = Purchase.query.get_or_404(pid)
     db.session.delete(p)
+    db.session.flush()
+    recompute_carry_from(p.category_id, month_start(p.ts))
     db.session.commit()
     flash("Purchase deleted.", "ok")
     return redirect(url_for("index"))
@@ -244,18 +383,21 @@ def edit(pid):
     if request.method == "POST":
         p.name = request.form["name"].strip()
         p.amount = float(request.form["amount"])
+        old_cat_id = p.category_id
         p.category_id = int(request.form["category_id"])
+        db.session.flush()
+        for cid in {old_cat_id, p.category_id}:
+            recompute_carry_from(cid, month_start(p.ts))
         db.session.commit()
         flash("Purchase updated.", "ok")
         return redirect(url_for("index"))
-    cats = sort_categories(Category.query.filter_by(is_active=True).all())
+    cats = Category.query.filter_by(is_active=True).order_by(*CATEGORY_ORDER).all()
     return render_template("edit.html", purchase=p, categories=cats)
 
 @app.route("/admin", methods=["GET", "POST"])
 def admin():
     cfg = load_cfg()
-    now = datetime.now(timezone.utc)
-    cur_start = month_start(now)
+    cur_start = g.cur_start
 
     # Unlock with PIN
     if request.method == "POST" and "pin" in request.form and not session.get("is_admin"):
@@ -269,23 +411,25 @@ def admin():
 
     # Save budgets (requires unlocked)
     if request.method == "POST" and session.get("is_admin"):
-        for c in Category.query.all():
+        cats = (Category.query
+                .options(selectinload(Category.monthly_budgets.and_(MonthlyBudget.month_start == cur_start)))
+                .all())
+        for c in cats:
             key = f"base_{c.id}"
             if key in request.form:
                 try:
                     val = float(request.form[key])
                 except ValueError:
                     continue
-                mb = get_or_create_monthly_budget(c, cur_start, 0.0)
+                mb = c.monthly_budgets[0] if c.monthly_budgets else get_or_create_monthly_budget(c, cur_start, 0.0, commit=False)
                 mb.base_budget = val
         db.session.commit()
         flash("This month's budgets updated.", "ok")
         return redirect(url_for("admin"))
 
-    items = []
-    for c in sort_categories(Category.query.all()):
-        mb = get_or_create_monthly_budget(c, cur_start, cfg["categories"].get(c.name, 0.0))
-        items.append((c, mb))
+    cats = Category.query.order_by(*CATEGORY_ORDER).all()
+    budget_map = latest_budget_map([c.id for c in cats], cur_start)
+    items = [(c, resolve_base_budget(c, budget_map.get(c.id), cfg)) for c in cats]
     return render_template("admin.html", items=items, is_admin=bool(session.get("is_admin")))
 
 @app.route("/logout")
@@ -296,22 +440,26 @@ def logout():
 
 @app.route("/totals")
 def totals():
-    now = datetime.now(timezone.utc)
+    # page shell only; the chart and table are filled from /totals.json
     active_only = request.args.get("active_only", "0") == "1"
-    rows, overall = ytd_totals(now, active_only=active_only)
+    return render_template("totals.html", year=g.now.year, active_only=active_only)
 
-    labels = [r["cat"].name for r in rows]
-    values = [round(r["spent"], 2) for r in rows]
+@app.route("/totals.json")
+def totals_json():
+    now = g.now
+    active_only = request.args.get("active_only", "0") == "1"
+    rows, overall = ytd_totals(now, active_only=active_only)
 
-    return render_template(
-        "totals.html",
-        labels=labels,
-        values=values,
-        rows=rows,
-        overall=overall,
+    resp = jsonify(
         year=now.year,
-        active_only=active_only,   # <-- pass to template
+        labels=[r["cat"].name for r in rows],
+        values=[round(r["spent"], 2) for r in rows],
+        overall=round(overall, 2),
     )
+    # ETag over the payload so refreshes with unchanged totals get a bodyless 304
+    resp.add_etag()
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
 
 
 